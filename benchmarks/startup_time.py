@@ -0,0 +1,120 @@
+# benchmarks/startup_time.py
+"""
+Mede o tempo de startup da API: import de `main` e tempo até o lifespan
+liberar o tráfego, com um dispositivo Modbus inacessível.
+
+Uso:
+    python benchmarks/startup_time.py [--runs 5] [--host 10.255.255.1] [--baseline 81bd7fe]
+
+Cada execução roda em um subprocesso novo para medir o import a frio.
+Com --baseline, a mesma medição é feita sobre a árvore de uma revisão git
+anterior (ex.: antes da conexão em background) e os resultados são comparados.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter() - t0
+
+async def run():
+    t1 = time.perf_counter()
+    async with main.app.router.lifespan_context(main.app):
+        t_ready = time.perf_counter() - t1
+    return t_ready
+
+t_ready = asyncio.run(run())
+print(json.dumps({"import_s": t_import, "lifespan_s": t_ready}))
+"""
+
+
+def export_revision(rev: str, dest: str) -> str:
+    """Extrai a árvore de uma revisão git em `dest`."""
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", rev],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(dest)
+    return dest
+
+
+def run_once(cwd: str, host: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("MODBUS_API_KEY", "benchmark")
+    env["MODBUS_HOST"] = host
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(results: list) -> dict:
+    return {
+        key: [r[key] * 1000 for r in results]
+        for key in ("import_s", "lifespan_s")
+    }
+
+
+def print_summary(label: str, summary: dict) -> None:
+    print(label)
+    for key, values in summary.items():
+        print(
+            f"  {key[:-2]:<10} median={statistics.median(values):8.1f} ms "
+            f"min={min(values):8.1f} ms max={max(values):8.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--host",
+        default="10.255.255.1",
+        help="Host Modbus (default: endereço não roteável, simula CLP offline)",
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="REV",
+        help="Revisão git para comparação (ex.: o commit anterior à conexão em background)",
+    )
+    args = parser.parse_args()
+
+    current = summarize([run_once(ROOT, args.host) for _ in range(args.runs)])
+    print_summary("atual", current)
+
+    if not args.baseline:
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = export_revision(args.baseline, tmp)
+        baseline = summarize([run_once(cwd, args.host) for _ in range(args.runs)])
+    print_summary(f"baseline ({args.baseline})", baseline)
+
+    print("comparação (mediana baseline / atual)")
+    for key in current:
+        before = statistics.median(baseline[key])
+        after = statistics.median(current[key])
+        print(f"  {key[:-2]:<10} {before:8.1f} ms -> {after:8.1f} ms ({before / after:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
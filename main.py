@@ -1,20 +1,29 @@
 # main.py
+import asyncio
 import math
 import os
-from contextlib import asynccontextmanager
-from typing import List, Optional, Union, Literal, Annotated
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Union, Literal, Annotated
 
 from fastapi import FastAPI, HTTPException, Query, Path, Depends, Header, status, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from pydantic import BaseModel, Field
 
-from pyModbusTCPtools import ModbusTCPResiliente, Endian, ModbusDataType
+# Apenas os enums são necessários no import (schemas); o cliente e o
+# registro de tags são carregados no startup, sob demanda.
+from pyModbusTCPtools import Endian, ModbusDataType
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from slowapi.middleware import SlowAPIASGIMiddleware
 
 import hmac
 
@@ -23,6 +32,14 @@ from dotenv import load_dotenv
 import logging
 from logging.handlers import RotatingFileHandler
 
+import tracing
+from write_suppression import WriteSuppressor
+
+if TYPE_CHECKING:
+    from pyModbusTCPtools import ModbusTCPResiliente
+    from slowapi.wrappers import Limit
+    from tags import Tag, TagRegistry
+
 load_dotenv()
 
 API_LOG_FILE = os.getenv("API_LOG_FILE", "api.log")
@@ -39,6 +56,8 @@ handler = RotatingFileHandler(
     backupCount=API_LOG_BACKUP_COUNT
 )
 
+tracing.setup_tracing(api_logger)
+
 API_KEY = os.getenv("MODBUS_API_KEY")
 
 if not API_KEY:
@@ -51,7 +70,11 @@ def validate_api_key(
 ):
     client_ip = request.client.host if request.client else "unknown"
 
-    if not (API_KEY and hmac.compare_digest(x_api_key, API_KEY)):
+    with tracing.span("auth.validate_api_key") as sp:
+        authorized = bool(API_KEY and hmac.compare_digest(x_api_key, API_KEY))
+        tracing.set_attribute(sp, "auth.ok", authorized)
+
+    if not authorized:
         api_logger.warning(
             f"AUTH failed invalid API key ip={client_ip} path={request.url.path}"
         )
@@ -60,6 +83,9 @@ def validate_api_key(
             detail="Unauthorized",
         )
 
+    # Espera em fila é medida a partir do fim da autenticação
+    request.state.trace_mark_ns = time.time_ns()
+
 def rate_limit_key(request: Request):
     api_key = request.headers.get("X-API-Key")
     ip = get_remote_address(request)
@@ -73,13 +99,65 @@ MODBUS_TIMEOUT = float(os.getenv("MODBUS_TIMEOUT", 3.0))
 MODBUS_PING_ADDR = int(os.getenv("MODBUS_PING_ADDR", 1))
 MODBUS_PING_COUNT = int(os.getenv("MODBUS_PING_COUNT", 1))
 
+# Readiness: exige conexão Modbus ativa para reportar ready (0 = não, 1 = sim)
+READINESS_REQUIRE_MODBUS = os.getenv("READINESS_REQUIRE_MODBUS", "0") == "1"
+# Backoff (segundos) das tentativas de conexão em background
+MODBUS_CONNECT_RETRY_MIN = float(os.getenv("MODBUS_CONNECT_RETRY_MIN", 1.0))
+MODBUS_CONNECT_RETRY_MAX = float(os.getenv("MODBUS_CONNECT_RETRY_MAX", 30.0))
+
+# Deadline padrão por requisição em segundos (0 = sem deadline, exceto via header)
+API_REQUEST_TIMEOUT = float(os.getenv("API_REQUEST_TIMEOUT", 30.0))
+# Limite superior aceito no header X-Request-Timeout
+API_REQUEST_TIMEOUT_MAX = float(os.getenv("API_REQUEST_TIMEOUT_MAX", 60.0))
+# Intervalo de verificação de desconexão do cliente / deadline
+DISCONNECT_POLL_INTERVAL = 0.1
+
+# Supressão de escritas redundantes (0 = desabilitado, 1 = habilitado)
+MODBUS_WRITE_SUPPRESSION = os.getenv("MODBUS_WRITE_SUPPRESSION", "0") == "1"
+# Janela (segundos) em que o último valor escrito é considerado o estado do dispositivo
+MODBUS_WRITE_SUPPRESSION_TTL = float(os.getenv("MODBUS_WRITE_SUPPRESSION_TTL", 5.0))
+
+# Registro de tags nomeadas (CSV ou YAML)
+MODBUS_TAGS_FILE = os.getenv("MODBUS_TAGS_FILE", "")
+
 # Logging opcional do client Modbus
 MODBUS_LOG_FILE = os.getenv("MODBUS_LOG_FILE", "modbus.log")
 MODBUS_CONSOLE_LOG = os.getenv("MODBUS_CONSOLE_LOG", "0")
 
 
+class TracedLimiter(Limiter):
+    """Limiter do SlowAPI com span em torno da verificação de rate limit."""
+
+    def _check_request_limit(self, request, *args, **kwargs):
+        with tracing.span("ratelimit.check", **{"url.path": request.url.path}):
+            return super()._check_request_limit(request, *args, **kwargs)
+
+
 # Criar o limiter global
-limiter = Limiter(key_func=rate_limit_key)
+limiter = TracedLimiter(key_func=rate_limit_key)
+
+
+@lru_cache(maxsize=None)
+def _handler_limit(value: str) -> "Limit":
+    from limits import parse as parse_limit
+    from slowapi.wrappers import Limit
+
+    return Limit(parse_limit(value), rate_limit_key, None, False, None, None, None, 1, False)
+
+# Escritas sujeitas à supressão verificam o rate limit no handler, após a
+# decisão de omitir: escritas omitidas não consomem o limite.
+WRITE_SINGLE_COIL_LIMIT = "5/second"
+WRITE_HOLDING_TYPED_LIMIT = "1/second"
+
+
+def check_rate_limit(request: Request, value: str, scope: str) -> None:
+    if not limiter.enabled:
+        return
+    limit = _handler_limit(value)
+    with tracing.span("ratelimit.check", **{"url.path": request.url.path}):
+        allowed = limiter.limiter.hit(limit.limit, rate_limit_key(request), scope)
+    if not allowed:
+        raise RateLimitExceeded(limit)
 
 
 class HealthResponse(BaseModel):
@@ -91,6 +169,11 @@ class HealthResponse(BaseModel):
     failure_count: int
     current_retry_delay: float
 
+class ReadinessResponse(BaseModel):
+    ready: bool
+    phase: Literal["connecting", "serving"]
+    connected: Optional[bool] = None
+
 class WriteSingleCoilRequest(BaseModel):
     value: bool = Field(..., description="Valor booleano a escrever na coil")
 
@@ -104,6 +187,8 @@ class ReadBitsResponse(BaseModel):
 
 class WriteResponse(BaseModel):
     ok: bool
+    elided: bool = False
+    elided_reason: Optional[Literal["unchanged", "superseded"]] = None
 
 class ReadRegistersResponse(BaseModel):
     addr: int
@@ -129,6 +214,26 @@ class TypedValueResponse(BaseModel):
     endian: Optional[str] = None
     value: Union[int, float]
 
+class TagDefinitionResponse(BaseModel):
+    name: str
+    table: str
+    addr: int
+    dtype: str
+    endian: Optional[str] = None
+    registers: int
+    description: str = ""
+
+class TagValueResponse(BaseModel):
+    name: str
+    table: str
+    addr: int
+    dtype: str
+    endian: Optional[str] = None
+    value: Union[int, float]
+
+class TagValuesResponse(BaseModel):
+    values: List[TagValueResponse]
+
 class TypedWriteValue(BaseModel):
     value: Union[int, float] = Field(..., description="Valor a escrever")
 
@@ -177,8 +282,46 @@ def validate_float_value(value: float) -> None:
     if math.isnan(v) or math.isinf(v):
         raise HTTPException(status_code=422, detail="FLOAT inválido: NaN/Inf não permitido")
 
+class RequestDeadline:
+    """Deadline e sinal de cancelamento de uma requisição HTTP."""
+
+    __slots__ = ("expires_at", "cancelled")
+
+    def __init__(self, timeout: Optional[float]):
+        self.expires_at = time.monotonic() + timeout if timeout else math.inf
+        self.cancelled = threading.Event()
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def drop_reason(self) -> Optional[str]:
+        if self.cancelled.is_set():
+            return "cancelled"
+        if self.remaining() <= 0:
+            return "deadline"
+        return None
+
+
+# Propagado do middleware para o threadpool via contextvars
+_request_deadline: ContextVar[Optional[RequestDeadline]] = ContextVar("request_deadline", default=None)
+
+# Serializa o acesso ao dispositivo: requisições aguardam aqui, e não no
+# cliente Modbus, para que possam ser descartadas antes de chegar ao barramento.
+_modbus_lock = threading.Lock()
+
+write_suppressor = WriteSuppressor(
+    ttl=MODBUS_WRITE_SUPPRESSION_TTL,
+    enabled=MODBUS_WRITE_SUPPRESSION,
+)
+
+SUPERSEDED_FAILED_DETAIL = (
+    "Escrita substituída por outra mais recente no mesmo endereço, que não foi aplicada"
+)
+
 # App state
-def _build_modbus_client() -> ModbusTCPResiliente:
+def _build_modbus_client() -> "ModbusTCPResiliente":
+    from pyModbusTCPtools import ModbusTCPResiliente
+
     return ModbusTCPResiliente(
         host=MODBUS_HOST,
         port=MODBUS_PORT,
@@ -189,21 +332,86 @@ def _build_modbus_client() -> ModbusTCPResiliente:
     )
 
 
+def _try_connect(app: FastAPI) -> bool:
+    """Tentativa de conexão em background, executada fora do event loop."""
+    t0 = time.perf_counter()
+    try:
+        with tracing.span("modbus.connect"), modbus_access("connect"):
+            connected = bool(app.state.modbus.is_connected())
+    except Exception as e:
+        api_logger.error(f"CONNECT modbus EXCEPTION err={e}")
+        connected = False
+
+    app.state.modbus_connected = connected
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    if connected:
+        api_logger.info(f"CONNECT modbus OK elapsed_ms={elapsed_ms:.0f}")
+    else:
+        api_logger.error(
+            f"CONNECT modbus NOT_CONNECTED host={MODBUS_HOST} port={MODBUS_PORT} "
+            f"unit={MODBUS_UNIT_ID} elapsed_ms={elapsed_ms:.0f}"
+        )
+    return connected
+
+
+async def _connection_supervisor(app: FastAPI) -> None:
+    """Conecta em background e, enquanto a conexão não estiver ativa,
+    tenta novamente com backoff exponencial."""
+    delay = MODBUS_CONNECT_RETRY_MIN
+    while True:
+        if app.state.modbus_connected is True:
+            delay = MODBUS_CONNECT_RETRY_MIN
+            await asyncio.sleep(MODBUS_CONNECT_RETRY_MIN)
+            continue
+
+        if await asyncio.to_thread(_try_connect, app):
+            continue
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MODBUS_CONNECT_RETRY_MAX)
+
+
+def _shutdown_close(app: FastAPI) -> None:
+    # Aguarda, via lock, uma tentativa de conexão ou transação em andamento
+    try:
+        with modbus_access("shutdown_close"):
+            app.state.modbus.close()
+    except Exception:
+        pass
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     api_logger.info("API iniciando")
     app.state.modbus = _build_modbus_client()
-    # Opcional: valida conexão no startup (não bloqueia seu serviço, apenas tenta)
+    app.state.modbus_connected = None
+
     try:
-        app.state.modbus.is_connected()
-    except Exception:
-        pass
+        from tags import load_tag_registry
+
+        app.state.tags = load_tag_registry(MODBUS_TAGS_FILE)
+    except Exception as e:
+        api_logger.error(f"TAGS load FAILED file={MODBUS_TAGS_FILE} err={e}")
+        raise RuntimeError(f"Falha ao carregar tags de {MODBUS_TAGS_FILE}: {e}") from e
+
+    if MODBUS_TAGS_FILE:
+        api_logger.info(
+            f"TAGS loaded file={MODBUS_TAGS_FILE} tags={len(app.state.tags)}"
+        )
+
+    # A conexão com o dispositivo não bloqueia o startup: a API passa a
+    # atender imediatamente e a conexão é tentada em background.
+    supervisor = asyncio.create_task(_connection_supervisor(app))
     yield
     api_logger.info("API finalizando")
+    supervisor.cancel()
     try:
-        app.state.modbus.close()
-    except Exception:
+        await supervisor
+    except asyncio.CancelledError:
         pass
+    await asyncio.to_thread(_shutdown_close, app)
+    tracing.shutdown_tracing()
 
 
 app = FastAPI(
@@ -213,7 +421,87 @@ app = FastAPI(
 )
 
 app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(SlowAPIASGIMiddleware)
+
+# Os middlewares abaixo são ASGI puros: sob BaseHTTPMiddleware o evento
+# http.disconnect não chega ao handler e o cancelamento nunca ocorre.
+class DeadlineMiddleware:
+    """Define o deadline da requisição e a marca como cancelada quando o
+    cliente desconecta (http.disconnect)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        raw = Headers(scope=scope).get("x-request-timeout")
+        timeout = API_REQUEST_TIMEOUT
+
+        if raw is not None:
+            try:
+                timeout = float(raw)
+            except ValueError:
+                timeout = math.nan
+            if not (0 < timeout < math.inf):
+                response = JSONResponse(
+                    status_code=422,
+                    content={"detail": "X-Request-Timeout inválido: informe segundos (> 0)"},
+                )
+                await response(scope, receive, send)
+                return
+            timeout = min(timeout, API_REQUEST_TIMEOUT_MAX)
+
+        deadline = RequestDeadline(timeout)
+
+        async def watched_receive():
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                deadline.cancelled.set()
+            return message
+
+        token = _request_deadline.set(deadline)
+        try:
+            await self.app(scope, watched_receive, send)
+        finally:
+            _request_deadline.reset(token)
+
+
+class TracingMiddleware:
+    """Span raiz por requisição HTTP."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["trace_mark_ns"] = time.time_ns()
+
+        method = scope["method"]
+        with tracing.server_span(method, scope["path"], Headers(scope=scope)) as sp:
+            async def traced_send(message):
+                if message["type"] == "http.response.start":
+                    tracing.set_attribute(sp, "http.response.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, traced_send)
+            finally:
+                # O roteamento preenche scope["route"] (path sem parâmetros resolvidos)
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    tracing.set_route(sp, method, route)
+
+
+app.add_middleware(DeadlineMiddleware)
+
+# Registrado depois do DeadlineMiddleware para envolvê-lo: respostas geradas
+# por ele (ex.: 422 de X-Request-Timeout inválido) também recebem os headers CORS.
 CORS_ALLOW_ORIGINS = os.getenv("CORS_ALLOW_ORIGINS", "")
 cors_origins = [o.strip() for o in CORS_ALLOW_ORIGINS.split(",") if o.strip()]
 
@@ -222,9 +510,12 @@ app.add_middleware(
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
-    allow_headers=["X-API-Key", "Content-Type"],
+    allow_headers=["X-API-Key", "Content-Type", "X-Request-Timeout"],
 )
 
+if tracing.enabled():
+    app.add_middleware(TracingMiddleware)
+
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     client_ip = request.client.host if request.client else "unknown"
@@ -241,12 +532,168 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
         },
     )
 
-def get_modbus(app: FastAPI) -> ModbusTCPResiliente:
+def get_modbus(app: FastAPI) -> "ModbusTCPResiliente":
     mb = getattr(app.state, "modbus", None)
     if mb is None:
         raise HTTPException(status_code=500, detail="Cliente Modbus não inicializado")
     return mb
 
+def trace_scheduling_wait(request: Request) -> None:
+    """Registra o tempo entre a chegada (ou autenticação) e o início do handler."""
+    start_ns = getattr(request.state, "trace_mark_ns", None)
+    if start_ns is not None:
+        tracing.record_span("scheduling.wait", start_ns)
+
+def _acquire_modbus(deadline: Optional[RequestDeadline]) -> Optional[str]:
+    """Aguarda a vez no dispositivo. Retorna o motivo do descarte, se houver."""
+    if deadline is None:
+        _modbus_lock.acquire()
+        return None
+
+    while True:
+        reason = deadline.drop_reason()
+        if reason is not None:
+            return reason
+        if _modbus_lock.acquire(
+            timeout=max(0.0, min(deadline.remaining(), DISCONNECT_POLL_INTERVAL))
+        ):
+            # Pode ter expirado durante a espera
+            reason = deadline.drop_reason()
+            if reason is not None:
+                _modbus_lock.release()
+            return reason
+
+@contextmanager
+def modbus_access(op: str):
+    """Acesso exclusivo ao cliente Modbus (transações, ping, close).
+
+    Requisições canceladas ou com deadline expirado são descartadas antes do envio.
+    O tempo em fila no lock é registrado no span modbus.queue_wait.
+    """
+    with tracing.span("modbus.queue_wait", **{"modbus.op": op}) as sp:
+        reason = _acquire_modbus(_request_deadline.get())
+        if reason is not None:
+            tracing.set_attribute(sp, "modbus.dropped", reason)
+
+    if reason is not None:
+        api_logger.warning(f"MODBUS DROPPED op={op} reason={reason}")
+        if reason == "deadline":
+            raise HTTPException(
+                status_code=504,
+                detail="Deadline da requisição excedido antes do envio ao dispositivo",
+            )
+        raise HTTPException(
+            status_code=503,
+            detail="Requisição cancelada: cliente desconectado",
+        )
+
+    try:
+        yield
+    finally:
+        _modbus_lock.release()
+
+def modbus_call(op: str, function_code: int, addr: int, count: int, fn, *args, after=None):
+    """Executa uma transação Modbus dentro de um span com FC/endereço/quantidade.
+
+    `after(result)` roda ainda com acesso exclusivo ao dispositivo, para que o
+    estado derivado (ex.: cache de supressão) siga a mesma ordem das escritas.
+    """
+    with modbus_access(f"{op} addr={addr} count={count}"):
+        # modbus.pdu começa após a espera no lock: mede apenas a resposta do dispositivo
+        with tracing.span(
+            "modbus.pdu",
+            **{
+                "modbus.op": op,
+                "modbus.function_code": function_code,
+                "modbus.address": addr,
+                "modbus.count": count,
+                "modbus.unit_id": MODBUS_UNIT_ID,
+            },
+        ) as sp:
+            result = fn(*args)
+            ok = result is not None and result is not False
+            tracing.set_attribute(sp, "modbus.ok", ok)
+
+        if after is not None:
+            after(result)
+
+    _update_connected(ok)
+    return result
+
+def _update_connected(ok: bool) -> None:
+    """Atualiza o estado de conexão usado pela readiness a partir das transações.
+
+    Uma falha só marca desconexão se o cliente registrou falha de conexão
+    (uma exceção Modbus, como endereço inválido, não derruba a readiness).
+    """
+    if ok:
+        app.state.modbus_connected = True
+    elif int(getattr(getattr(app.state, "modbus", None), "failure_count", 0)) > 0:
+        app.state.modbus_connected = False
+
+def _discard_result(task: asyncio.Future) -> None:
+    if not task.cancelled():
+        task.exception()
+
+async def run_cancellable(request: Request, fn, *args):
+    """Executa uma leitura no threadpool, abandonando-a se o cliente desconectar
+    ou o deadline expirar. Transações ainda não enviadas são descartadas."""
+    deadline = _request_deadline.get() or RequestDeadline(None)
+    work = asyncio.ensure_future(run_in_threadpool(fn, *args))
+
+    while True:
+        done, _ = await asyncio.wait({work}, timeout=DISCONNECT_POLL_INTERVAL)
+        if done:
+            return work.result()
+
+        if deadline.cancelled.is_set() or await request.is_disconnected():
+            status_code, detail, reason = 503, "Requisição cancelada: cliente desconectado", "cancelled"
+        elif deadline.remaining() <= 0:
+            status_code, detail, reason = 504, "Deadline da requisição excedido", "deadline"
+        else:
+            continue
+
+        deadline.cancelled.set()
+        # A transação em andamento não é interrompida; o resultado é descartado
+        work.add_done_callback(_discard_result)
+
+        client_ip = request.client.host if request.client else "unknown"
+        api_logger.warning(
+            f"REQUEST abandoned reason={reason} path={request.url.path} ip={client_ip}"
+        )
+        raise HTTPException(status_code=status_code, detail=detail)
+
+@app.get(
+    "/health/live",
+    summary="Liveness",
+    description="Indica que o processo HTTP está atendendo. Não acessa o dispositivo Modbus.",
+)
+async def health_live():
+    return {"ok": True}
+
+
+@app.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    summary="Readiness",
+    description=(
+        "Indica se a API está pronta para receber tráfego. Não acessa o dispositivo Modbus: "
+        "reporta o estado da fase de conexão em background."
+    ),
+    responses={503: {"model": ReadinessResponse}},
+)
+async def health_ready():
+    connected = getattr(app.state, "modbus_connected", None)
+    phase = "connecting" if connected is None else "serving"
+
+    ready = connected is True if READINESS_REQUIRE_MODBUS else True
+    body = ReadinessResponse(ready=ready, phase=phase, connected=connected)
+
+    if not ready:
+        return JSONResponse(status_code=503, content=body.model_dump())
+    return body
+
+
 @app.get(
     "/health/modbus",
     response_model=HealthResponse,
@@ -257,13 +704,17 @@ def health_modbus(request: Request):
     client_ip = request.client.host if request.client else "unknown"
     mb = get_modbus(app)
 
-    try:
-        connected = bool(mb.is_connected())
-    except Exception as e:
-        api_logger.error(
-            f"HEALTH modbus FAILED exception={e} ip={client_ip}"
-        )
-        connected = False
+    with modbus_access("health_is_connected"):
+        try:
+            with tracing.span("modbus.is_connected"):
+                connected = bool(mb.is_connected())
+        except Exception as e:
+            api_logger.error(
+                f"HEALTH modbus FAILED exception={e} ip={client_ip}"
+            )
+            connected = False
+
+    app.state.modbus_connected = connected
 
     # Log apenas se estiver desconectado
     if not connected:
@@ -299,24 +750,27 @@ def modbus_close(request: Request):
     )
 
     mb = get_modbus(app)
-    try:
-        mb.close()
+    with modbus_access("close"):
+        # Com acesso exclusivo: uma escrita em andamento não confirma depois do clear
+        write_suppressor.clear()
+        try:
+            mb.close()
 
-        # 2 Sucesso
-        api_logger.info(
-            f"MODBUS CLOSE OK ip={client_ip}"
-        )
-        return WriteResponse(ok=True)
+            # 2 Sucesso
+            api_logger.info(
+                f"MODBUS CLOSE OK ip={client_ip}"
+            )
+            return WriteResponse(ok=True)
 
-    except Exception as e:
-        # 3 Falha
-        api_logger.error(
-            f"MODBUS CLOSE FAILED ip={client_ip} err={e}"
-        )
-        raise HTTPException(
-            status_code=500,
-            detail="Falha ao fechar conexão Modbus"
-        )
+        except Exception as e:
+            # 3 Falha
+            api_logger.error(
+                f"MODBUS CLOSE FAILED ip={client_ip} err={e}"
+            )
+            raise HTTPException(
+                status_code=500,
+                detail="Falha ao fechar conexão Modbus"
+            )
 
 
 @app.post(
@@ -337,35 +791,43 @@ def modbus_reconnect(request: Request):
 
     mb = get_modbus(app)
 
-    # Fecha conexão atual (se existir)
-    try:
-        mb.close()
-        api_logger.info(
-            f"MODBUS RECONNECT previous connection closed ip={client_ip}"
-        )
-    except Exception:
-        api_logger.warning(
-            f"MODBUS RECONNECT no active connection to close ip={client_ip}"
-        )
-
-    # Tenta reconectar
-    try:
-        connected = bool(mb.is_connected())
+    # Close + reconexão como uma única seção exclusiva no dispositivo
+    with modbus_access("reconnect"):
+        # Com acesso exclusivo: uma escrita em andamento não confirma depois do clear
+        write_suppressor.clear()
 
-        if connected:
+        # Fecha conexão atual (se existir)
+        try:
+            mb.close()
             api_logger.info(
-                f"MODBUS RECONNECT OK ip={client_ip}"
+                f"MODBUS RECONNECT previous connection closed ip={client_ip}"
             )
-        else:
+        except Exception:
+            api_logger.warning(
+                f"MODBUS RECONNECT no active connection to close ip={client_ip}"
+            )
+
+        # Tenta reconectar
+        try:
+            with tracing.span("modbus.is_connected"):
+                connected = bool(mb.is_connected())
+
+            if connected:
+                api_logger.info(
+                    f"MODBUS RECONNECT OK ip={client_ip}"
+                )
+            else:
+                api_logger.error(
+                    f"MODBUS RECONNECT FAILED ip={client_ip}"
+                )
+
+        except Exception as e:
             api_logger.error(
-                f"MODBUS RECONNECT FAILED ip={client_ip}"
+                f"MODBUS RECONNECT ERROR ip={client_ip} err={e}"
             )
+            connected = False
 
-    except Exception as e:
-        api_logger.error(
-            f"MODBUS RECONNECT ERROR ip={client_ip} err={e}"
-        )
-        connected = False
+    app.state.modbus_connected = connected
 
     return HealthResponse(
         ok=True,
@@ -384,11 +846,14 @@ def modbus_reconnect(request: Request):
     summary="List coils",
     description="Lê coils a partir de um endereço inicial utilizando Modbus TCP.",
 )
-def read_coils(
+async def read_coils(
     request: Request,
     addr: int = Query(..., ge=0, description="Endereço inicial (0-based)"),
     count: int = Query(1, ge=1, le=2000, description="Quantidade de coils"),
 ):
+    return await run_cancellable(request, _read_coils, request, addr, count)
+
+def _read_coils(request: Request, addr: int, count: int) -> ReadBitsResponse:
     client_ip = request.client.host if request.client else "unknown"
     mb = get_modbus(app)
 
@@ -397,7 +862,8 @@ def read_coils(
         f"READ coils requested addr={addr} count={count} ip={client_ip}"
     )
 
-    values = mb.read_coils_safe(addr, count)
+    trace_scheduling_wait(request)
+    values = modbus_call("read_coils", 0x01, addr, count, mb.read_coils_safe, addr, count)
 
     # 2 Falha
     if values is None:
@@ -426,11 +892,14 @@ def read_coils(
     summary="List discrete inputs",
     description="Lê discrete inputs a partir de um endereço inicial utilizando Modbus TCP.",
 )
-def read_discrete_inputs(
+async def read_discrete_inputs(
     request: Request,
     addr: int = Query(..., ge=0, description="Endereço inicial (0-based)"),
     count: int = Query(1, ge=1, le=2000, description="Quantidade de discrete inputs"),
 ):
+    return await run_cancellable(request, _read_discrete_inputs, request, addr, count)
+
+def _read_discrete_inputs(request: Request, addr: int, count: int) -> ReadBitsResponse:
     client_ip = request.client.host if request.client else "unknown"
     mb = get_modbus(app)
 
@@ -439,7 +908,10 @@ def read_discrete_inputs(
         f"READ discrete_inputs requested addr={addr} count={count} ip={client_ip}"
     )
 
-    values = mb.read_discrete_inputs_safe(addr, count)
+    trace_scheduling_wait(request)
+    values = modbus_call(
+        "read_discrete_inputs", 0x02, addr, count, mb.read_discrete_inputs_safe, addr, count
+    )
 
     # 2 Falha
     if values is None:
@@ -469,7 +941,6 @@ def read_discrete_inputs(
     summary="Update single coil",
     description="Escreve o valor de uma única coil no endereço informado utilizando Modbus TCP.",
 )
-@limiter.limit("5/second")
 def write_single_coil(
     request: Request,
     addr: int = Query(..., ge=0, description="Endereço da coil (0-based)"),
@@ -483,7 +954,27 @@ def write_single_coil(
     )
 
     mb = get_modbus(app)
-    ok = bool(mb.write_single_coil_safe(addr, payload.value))
+    trace_scheduling_wait(request)
+    with write_suppressor.guard("coil", addr, 1, bool(payload.value)) as guard:
+        if guard.elided is None:
+            check_rate_limit(request, WRITE_SINGLE_COIL_LIMIT, "write_single_coil")
+            ok = bool(modbus_call(
+                "write_single_coil", 0x05, addr, 1, mb.write_single_coil_safe, addr, payload.value,
+                after=lambda result: guard.done(bool(result)),
+            ))
+
+    if guard.elided is not None:
+        # Substituída: reporta o resultado da escrita mais recente
+        if not guard.ok:
+            api_logger.error(
+                f"WRITE single coil SUPERSEDED by failed write addr={addr} ip={client_ip}"
+            )
+            raise HTTPException(status_code=503, detail=SUPERSEDED_FAILED_DETAIL)
+
+        api_logger.info(
+            f"WRITE single coil ELIDED addr={addr} reason={guard.elided} ip={client_ip}"
+        )
+        return WriteResponse(ok=True, elided=True, elided_reason=guard.elided)
 
     # 2 LOG DE FALHA
     if not ok:
@@ -534,7 +1025,14 @@ def write_multiple_coils(
     )
 
     mb = get_modbus(app)
-    ok = bool(mb.write_multiple_coils_safe(addr, payload.values))
+    trace_scheduling_wait(request)
+    # Invalida antes (escritas simples concorrentes não são omitidas) e depois,
+    # com acesso exclusivo (descarta confirmações anteriores à escrita múltipla)
+    write_suppressor.invalidate("coil", addr, count)
+    ok = bool(modbus_call(
+        "write_multiple_coils", 0x0F, addr, count, mb.write_multiple_coils_safe, addr, payload.values,
+        after=lambda _: write_suppressor.invalidate("coil", addr, count),
+    ))
 
     # 3 Falha
     if not ok:
@@ -591,15 +1089,26 @@ def write_read_multiple_registers(
     # 2 Intenção
     api_logger.warning(
         f"WRITE/READ requested write_addr={payload.write_addr} write_count={len(payload.write_values)} "
-        f"read_addr={payload.read_addr} read_count={payload.read_count} ip={client_ip}"
+        f"read_addr={payload.read_addr} read_count={payload.read_count} "
+        f"tags={tags_in_range('holding', payload.write_addr, len(payload.write_values))} ip={client_ip}"
     )
 
     mb = get_modbus(app)
-    regs = mb.write_read_multiple_registers_safe(
+    trace_scheduling_wait(request)
+    write_suppressor.invalidate("holding", payload.write_addr, len(payload.write_values))
+    regs = modbus_call(
+        "write_read_multiple_registers",
+        0x17,
+        payload.write_addr,
+        len(payload.write_values),
+        mb.write_read_multiple_registers_safe,
         payload.write_addr,
         [int(v) for v in payload.write_values],
         payload.read_addr,
         payload.read_count,
+        after=lambda _: write_suppressor.invalidate(
+            "holding", payload.write_addr, len(payload.write_values)
+        ),
     )
 
     # 3 Falha
@@ -630,13 +1139,16 @@ def write_read_multiple_registers(
     summary="Read typed registers",
     description="Lê registradores holding ou input interpretando o valor conforme o tipo de dado informado.",
 )
-def read_registers_typed(
+async def read_registers_typed(
     request: Request,
     table: Literal["holding", "input"] = Query(..., description="Tabela de registradores"),
     addr: int = Query(..., ge=0, description="Endereço inicial (0-based)"),
     dtype: ModbusDataType = Query(..., description="Tipo de dado"),
     endian: Endian = Query(Endian.BE, description="Endianness (apenas para 32/64 bits)"),
 ):
+    return await run_cancellable(request, _read_registers_typed, request, table, addr, dtype, endian)
+
+def _read_registers_typed(request: Request, table: str, addr: int, dtype: ModbusDataType, endian: Endian) -> TypedValueResponse:
     client_ip = request.client.host if request.client else "unknown"
     mb = get_modbus(app)
 
@@ -652,10 +1164,15 @@ def read_registers_typed(
         f"READ typed requested table={table} addr={addr} dtype={dtype.value} endian={en.value} ip={client_ip}"
     )
 
+    trace_scheduling_wait(request)
     if table == "holding":
-        val = mb.read_holding_typed_safe(addr, dtype, en)
+        val = modbus_call(
+            "read_holding_typed", 0x03, addr, dtype.registers, mb.read_holding_typed_safe, addr, dtype, en
+        )
     else:
-        val = mb.read_input_typed_safe(addr, dtype, en)
+        val = modbus_call(
+            "read_input_typed", 0x04, addr, dtype.registers, mb.read_input_typed_safe, addr, dtype, en
+        )
 
     if val is None:
         api_logger.error(
@@ -666,7 +1183,8 @@ def read_registers_typed(
             detail="Falha ao ler registrador typed (conexão/endereçamento/timeout)",
         )
 
-    out_val: Union[int, float] = float(val) if dtype.is_float else int(val)
+    with tracing.span("convert.value", **{"modbus.dtype": dtype.value}):
+        out_val: Union[int, float] = float(val) if dtype.is_float else int(val)
 
     api_logger.info(
         f"READ typed OK table={table} addr={addr} dtype={dtype.value} value={out_val} ip={client_ip}"
@@ -687,7 +1205,6 @@ def read_registers_typed(
     summary="Write typed holding registers",
     description="Escreve um valor em registradores holding utilizando tipo de dado definido.",
 )
-@limiter.limit("1/second")
 def write_holding_register_typed(
     request: Request,
     addr: int = Query(..., ge=0, description="Endereço inicial (0-based)"),
@@ -702,39 +1219,68 @@ def write_holding_register_typed(
 
     # 1 Intenção
     api_logger.warning(
-        f"WRITE typed requested addr={addr} dtype={dtype.value} endian={en.value} value={payload.value} ip={client_ip}"
+        f"WRITE typed requested addr={addr} dtype={dtype.value} endian={en.value} value={payload.value} "
+        f"tags={tags_in_range('holding', addr, dtype.registers)} ip={client_ip}"
     )
 
+    trace_scheduling_wait(request)
     try:
-        if dtype.is_float:
-            validate_float_value(float(payload.value))
-            ok = bool(
-                mb.write_holding_typed_safe(addr, float(payload.value), dtype, en)
-            )
-        else:
-            if isinstance(payload.value, float) and not float(payload.value).is_integer():
-                api_logger.warning(
-                    f"WRITE typed INVALID integer value={payload.value} ip={client_ip}"
-                )
-                raise HTTPException(
-                    status_code=422,
-                    detail="Valor inteiro inválido: não pode ter casas decimais"
-                )
-
-            validate_typed_value(dtype, int(payload.value))
-            ok = bool(
-                mb.write_holding_typed_safe(addr, int(payload.value), dtype, en)
-            )
-
-    except HTTPException:
+        with tracing.span("validate.value", **{"modbus.dtype": dtype.value}):
+            if dtype.is_float:
+                validate_float_value(float(payload.value))
+                value: Union[int, float] = float(payload.value)
+            else:
+                if isinstance(payload.value, float) and not float(payload.value).is_integer():
+                    api_logger.warning(
+                        f"WRITE typed INVALID integer value={payload.value} ip={client_ip}"
+                    )
+                    raise HTTPException(
+                        status_code=422,
+                        detail="Valor inteiro inválido: não pode ter casas decimais"
+                    )
+
+                validate_typed_value(dtype, int(payload.value))
+                value = int(payload.value)
+
+        with write_suppressor.guard(
+            "holding", addr, dtype.registers, (dtype.value, en.value, value)
+        ) as guard:
+            if guard.elided is None:
+                check_rate_limit(request, WRITE_HOLDING_TYPED_LIMIT, "write_holding_register_typed")
+                # FC06 para 1 registrador, FC16 para 32/64 bits
+                ok = bool(modbus_call(
+                    "write_holding_typed",
+                    0x06 if dtype.registers == 1 else 0x10,
+                    addr,
+                    dtype.registers,
+                    mb.write_holding_typed_safe,
+                    addr, value, dtype, en,
+                    after=lambda result: guard.done(bool(result)),
+                ))
+
+    except (HTTPException, RateLimitExceeded):
         raise
 
     except Exception as e:
+        write_suppressor.invalidate("holding", addr, dtype.registers)
         api_logger.error(
             f"WRITE typed EXCEPTION addr={addr} dtype={dtype.value} error={e} ip={client_ip}"
         )
         raise HTTPException(500, "Erro interno ao escrever registrador typed")
 
+    if guard.elided is not None:
+        # Substituída: reporta o resultado da escrita mais recente
+        if not guard.ok:
+            api_logger.error(
+                f"WRITE typed SUPERSEDED by failed write addr={addr} dtype={dtype.value} ip={client_ip}"
+            )
+            raise HTTPException(status_code=503, detail=SUPERSEDED_FAILED_DETAIL)
+
+        api_logger.info(
+            f"WRITE typed ELIDED addr={addr} dtype={dtype.value} reason={guard.elided} ip={client_ip}"
+        )
+        return WriteResponse(ok=True, elided=True, elided_reason=guard.elided)
+
     # 2 Falha
     if not ok:
         api_logger.error(
@@ -752,3 +1298,131 @@ def write_holding_register_typed(
 
     return WriteResponse(ok=True)
 
+
+def tags_in_range(table: str, addr: int, count: int) -> str:
+    """Nomes das tags afetadas por uma escrita, para o log de auditoria."""
+    tags = getattr(app.state, "tags", None)
+    names = [t.name for t in tags.overlapping(table, addr, count)] if tags is not None else []
+    return ",".join(names) or "-"
+
+def get_tags(app: FastAPI) -> "TagRegistry":
+    tags = getattr(app.state, "tags", None)
+    if tags is None:
+        raise HTTPException(status_code=500, detail="Registro de tags não inicializado")
+    return tags
+
+def resolve_tag(tags: "TagRegistry", name: str) -> "Tag":
+    tag = tags.get(name)
+    if tag is None:
+        raise HTTPException(status_code=404, detail=f"Tag não encontrada: {name}")
+    return tag
+
+def read_tag(mb: "ModbusTCPResiliente", tag: "Tag", client_ip: str) -> TagValueResponse:
+    # Mesmo método typed de /modbus/registers/typed: endian com a mesma semântica
+    val = modbus_call(
+        f"read_tag:{tag.name}",
+        tag.function_code,
+        tag.addr,
+        tag.registers,
+        getattr(mb, tag.read_method),
+        *tag.read_args,
+    )
+
+    if val is None:
+        api_logger.error(
+            f"READ tag FAILED name={tag.name} table={tag.table} addr={tag.addr} ip={client_ip}"
+        )
+        raise HTTPException(
+            status_code=503,
+            detail=f"Falha ao ler tag {tag.name} (conexão/endereçamento/timeout)",
+        )
+
+    return TagValueResponse(
+        name=tag.name,
+        table=tag.table,
+        addr=tag.addr,
+        dtype=tag.dtype.value,
+        endian=tag.endian_out,
+        value=tag.cast(val),
+    )
+
+@app.get(
+    "/tags",
+    response_model=List[TagDefinitionResponse],
+    summary="List tags",
+    description="Lista as tags nomeadas carregadas do arquivo de tags, com endereço e tipo.",
+)
+def list_tags():
+    return [
+        TagDefinitionResponse(
+            name=t.name,
+            table=t.table,
+            addr=t.addr,
+            dtype=t.dtype.value,
+            endian=t.endian_out,
+            registers=t.registers,
+            description=t.description,
+        )
+        for t in get_tags(app)
+    ]
+
+@app.get(
+    "/tags/values",
+    response_model=TagValuesResponse,
+    summary="Read multiple tags",
+    description="Lê várias tags nomeadas, cada uma com o endereço, tipo e endianness definidos no arquivo de tags.",
+)
+async def read_tags(
+    request: Request,
+    names: List[str] = Query(..., min_length=1, max_length=100, description="Nomes das tags"),
+):
+    return await run_cancellable(request, _read_tags, request, names)
+
+def _read_tags(request: Request, names: List[str]) -> TagValuesResponse:
+    client_ip = request.client.host if request.client else "unknown"
+    tags = get_tags(app)
+    requested = [resolve_tag(tags, n) for n in dict.fromkeys(names)]
+    mb = get_modbus(app)
+
+    api_logger.info(
+        f"READ tags requested count={len(requested)} ip={client_ip}"
+    )
+
+    trace_scheduling_wait(request)
+    values = [read_tag(mb, tag, client_ip) for tag in requested]
+
+    api_logger.info(
+        f"READ tags OK count={len(requested)} ip={client_ip}"
+    )
+
+    return TagValuesResponse(values=values)
+
+@app.get(
+    "/tags/{name}",
+    response_model=TagValueResponse,
+    summary="Read tag",
+    description="Lê uma tag nomeada utilizando o endereço, tipo e endianness definidos no arquivo de tags.",
+)
+async def read_tag_by_name(
+    request: Request,
+    name: str = Path(..., description="Nome da tag"),
+):
+    return await run_cancellable(request, _read_tag_by_name, request, name)
+
+def _read_tag_by_name(request: Request, name: str) -> TagValueResponse:
+    client_ip = request.client.host if request.client else "unknown"
+    tag = resolve_tag(get_tags(app), name)
+    mb = get_modbus(app)
+
+    api_logger.info(
+        f"READ tag requested name={tag.name} table={tag.table} addr={tag.addr} ip={client_ip}"
+    )
+
+    trace_scheduling_wait(request)
+    out = read_tag(mb, tag, client_ip)
+
+    api_logger.info(
+        f"READ tag OK name={tag.name} value={out.value} ip={client_ip}"
+    )
+
+    return out
@@ -0,0 +1,189 @@
+# tags.py
+"""
+Registro de tags nomeadas (CSV ou YAML) compilado no startup.
+
+Cada tabela (holding/input) recebe um índice de intervalos ordenado por
+endereço, permitindo localizar as tags afetadas por um intervalo de
+registradores em O(log n).
+Cada tag carrega sua leitura pré-resolvida (método typed da biblioteca,
+argumentos e conversão de saída), eliminando ramificações por requisição.
+A decodificação é a mesma de /modbus/registers/typed: os valores são lidos
+pelos métodos typed do pyModbusTCPtools, que aplicam o endian.
+"""
+import csv
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from pyModbusTCPtools import Endian, ModbusDataType
+
+_READ_METHODS = {
+    "holding": "read_holding_typed_safe",
+    "input": "read_input_typed_safe",
+}
+
+_FUNCTION_CODES = {
+    "holding": 0x03,
+    "input": 0x04,
+}
+
+# Colidem com rotas fixas de /tags/{name}
+_RESERVED_NAMES = {"values"}
+
+
+@dataclass(frozen=True)
+class Tag:
+    name: str
+    table: str
+    addr: int
+    dtype: ModbusDataType
+    endian: Endian
+    description: str
+    # Leitura pré-resolvida
+    registers: int
+    function_code: int
+    read_method: str
+    read_args: Tuple
+    cast: Callable[[Union[int, float]], Union[int, float]]
+    endian_out: Optional[str]
+
+    @property
+    def end(self) -> int:
+        return self.addr + self.registers
+
+
+@dataclass
+class _TableIndex:
+    starts: List[int] = field(default_factory=list)
+    tags: List[Tag] = field(default_factory=list)
+
+    def overlapping(self, addr: int, count: int) -> List[Tag]:
+        end = addr + count
+        # Tags não se sobrepõem: só a anterior ao início pode cobrir `addr`
+        i = max(bisect_right(self.starts, addr) - 1, 0)
+        out = []
+        while i < len(self.tags) and self.starts[i] < end:
+            if self.tags[i].end > addr:
+                out.append(self.tags[i])
+            i += 1
+        return out
+
+
+class TagRegistry:
+    """Tags compiladas: busca por nome e por endereço."""
+
+    def __init__(self, tags: List[Tag]):
+        self._by_name: Dict[str, Tag] = {t.name: t for t in tags}
+        self._tables: Dict[str, _TableIndex] = {}
+        for t in sorted(tags, key=lambda t: (t.table, t.addr)):
+            idx = self._tables.setdefault(t.table, _TableIndex())
+            idx.starts.append(t.addr)
+            idx.tags.append(t)
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def get(self, name: str) -> Optional[Tag]:
+        return self._by_name.get(name)
+
+    def overlapping(self, table: str, addr: int, count: int = 1) -> List[Tag]:
+        """Tags que ocupam algum registrador do intervalo [addr, addr + count)."""
+        idx = self._tables.get(table)
+        return idx.overlapping(addr, count) if idx is not None else []
+
+
+def _compile_tag(row: dict, line: str) -> dict:
+    name = str(row.get("name") or "").strip()
+    if not name:
+        raise ValueError(f"{line}: campo 'name' obrigatório")
+    if name in _RESERVED_NAMES or "/" in name:
+        raise ValueError(f"{line}: nome de tag inválido '{name}' (reservado ou contém '/')")
+
+    table = str(row.get("table") or "").strip().lower()
+    if table not in _READ_METHODS:
+        raise ValueError(f"{line}: tag '{name}' com table inválida '{table}' (holding/input)")
+
+    try:
+        addr = int(row.get("addr"))
+        dtype = ModbusDataType(str(row.get("dtype")).strip().lower())
+        endian = Endian(str(row.get("endian") or Endian.BE.value).strip().lower())
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{line}: tag '{name}' inválida ({e})") from e
+
+    if addr < 0 or addr + dtype.registers > 0x10000:
+        raise ValueError(f"{line}: tag '{name}' com endereço fora do range ({addr})")
+
+    # endian irrelevante para 16 bits
+    if dtype.registers == 1:
+        endian = Endian.BE
+
+    return {
+        "name": name,
+        "table": table,
+        "addr": addr,
+        "dtype": dtype,
+        "endian": endian,
+        "description": str(row.get("description") or ""),
+        "registers": dtype.registers,
+        "function_code": _FUNCTION_CODES[table],
+        "read_method": _READ_METHODS[table],
+        "read_args": (addr, dtype, endian),
+        "cast": float if dtype.is_float else int,
+        "endian_out": None if dtype.registers == 1 else endian.value,
+    }
+
+
+def compile_tags(rows: List[dict]) -> TagRegistry:
+    """Valida as definições e detecta nomes duplicados e tags sobrepostas."""
+    tags = [Tag(**_compile_tag(row, f"tag #{i + 1}")) for i, row in enumerate(rows)]
+
+    seen = set()
+    for t in tags:
+        if t.name in seen:
+            raise ValueError(f"tag duplicada '{t.name}'")
+        seen.add(t.name)
+
+    ordered = sorted(tags, key=lambda t: (t.table, t.addr))
+    for prev, t in zip(ordered, ordered[1:]):
+        if t.table == prev.table and t.addr < prev.end:
+            raise ValueError(
+                f"tags sobrepostas '{prev.name}' e '{t.name}' "
+                f"(table={t.table} addr={t.addr})"
+            )
+
+    return TagRegistry(tags)
+
+
+def load_tag_rows(path: str) -> List[dict]:
+    """Lê definições de tags de um arquivo CSV ou YAML."""
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    if ext in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise RuntimeError("PyYAML é necessário para arquivos de tags YAML") from e
+
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or []
+        if isinstance(data, dict):
+            data = data.get("tags", [])
+        if not isinstance(data, list):
+            raise ValueError("arquivo YAML de tags deve conter uma lista em 'tags'")
+        return data
+
+    raise ValueError(f"formato de arquivo de tags não suportado: {ext}")
+
+
+def load_tag_registry(path: Optional[str]) -> TagRegistry:
+    if not path:
+        return TagRegistry([])
+    return compile_tags(load_tag_rows(path))
@@ -0,0 +1,138 @@
+# tests/conftest.py
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("MODBUS_API_KEY", "test-key")
+os.environ.setdefault("API_LOG_FILE", os.path.join(os.path.dirname(__file__), "api-test.log"))
+
+API_KEY = os.environ["MODBUS_API_KEY"]
+
+
+class FakeModbus:
+    """Dispositivo Modbus em memória. Registra cada transação ao ser enviada."""
+
+    failure_count = 0
+    current_retry_delay = 0.0
+
+    def __init__(self):
+        self.calls = []
+        self.delays = {}
+        self.coils = {}
+        self.typed = {}
+        self.connected = True
+        self.busy = 0
+        self.overlaps = []
+        self._lock = threading.Lock()
+
+    def _send(self, op, addr, *extra):
+        with self._lock:
+            self.calls.append((op, addr) + extra)
+            if self.busy:
+                self.overlaps.append(op)
+            self.busy += 1
+        try:
+            time.sleep(self.delays.get((op, addr), 0))
+        finally:
+            with self._lock:
+                self.busy -= 1
+
+    def is_connected(self):
+        self._send("is_connected", None)
+        return self.connected
+
+    def close(self):
+        self._send("close", None)
+
+    def read_coils_safe(self, addr, count):
+        self._send("read_coils", addr, count)
+        return [self.coils.get(a, False) for a in range(addr, addr + count)]
+
+    def write_single_coil_safe(self, addr, value):
+        self._send("write_single_coil", addr, bool(value))
+        self.coils[addr] = bool(value)
+        return True
+
+    def write_multiple_coils_safe(self, addr, values):
+        self._send("write_multiple_coils", addr, tuple(values))
+        for i, v in enumerate(values):
+            self.coils[addr + i] = bool(v)
+        return True
+
+    def read_holding_typed_safe(self, addr, dtype, endian):
+        self._send("read_holding_typed", addr, dtype.value, endian.value)
+        return self.typed.get(("holding", addr), 0)
+
+    def read_input_typed_safe(self, addr, dtype, endian):
+        self._send("read_input_typed", addr, dtype.value, endian.value)
+        return self.typed.get(("input", addr), 0)
+
+
+@pytest.fixture
+def main():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("slowapi")
+    pytest.importorskip("pyModbusTCPtools")
+    import main as main_module
+    return main_module
+
+
+@pytest.fixture
+def fake_modbus(main):
+    mb = FakeModbus()
+    main.app.state.modbus = mb
+    main.app.state.modbus_connected = True
+    main.limiter.reset()
+    main.write_suppressor.clear()
+    yield mb
+    main.app.state.modbus = None
+
+
+async def asgi_request(app, method, path, query="", headers=(), body=b"", disconnect_after=None,
+                       with_headers=False):
+    """Envia uma requisição ASGI; opcionalmente o cliente desconecta após N segundos."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    disconnected = asyncio.Event()
+    body_sent = False
+
+    if disconnect_after is not None:
+        asyncio.get_running_loop().call_later(disconnect_after, disconnected.set)
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    disconnected.set()
+
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    payload = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    if with_headers:
+        headers = {k.decode(): v.decode() for k, v in start.get("headers", [])}
+        return start["status"], payload, headers
+    return start["status"], payload
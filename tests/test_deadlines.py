@@ -0,0 +1,101 @@
+# tests/test_deadlines.py
+import asyncio
+
+from conftest import API_KEY, asgi_request
+
+
+def test_queued_read_is_dropped_when_client_disconnects(main, fake_modbus):
+    fake_modbus.delays[("read_coils", 0)] = 1.0
+
+    async def scenario():
+        busy = asyncio.create_task(
+            asgi_request(main.app, "GET", "/modbus/coils", "addr=0&count=1")
+        )
+        await asyncio.sleep(0.1)
+        # Fica na fila atrás da leitura lenta; o cliente fecha o socket antes da vez
+        abandoned = asyncio.create_task(
+            asgi_request(main.app, "GET", "/modbus/coils", "addr=10&count=1", disconnect_after=0.2)
+        )
+        results = await asyncio.gather(busy, abandoned)
+        # A thread abandonada só observa o cancelamento ao disputar o dispositivo
+        await asyncio.sleep(0.5)
+        return results
+
+    (busy_status, _), (abandoned_status, _) = asyncio.run(scenario())
+
+    assert busy_status == 200
+    assert abandoned_status == 503
+    assert ("read_coils", 0, 1) in fake_modbus.calls
+    assert ("read_coils", 10, 1) not in fake_modbus.calls
+
+
+def test_queued_read_is_dropped_after_deadline(main, fake_modbus):
+    fake_modbus.delays[("read_coils", 0)] = 0.6
+
+    async def scenario():
+        busy = asyncio.create_task(
+            asgi_request(main.app, "GET", "/modbus/coils", "addr=0&count=1")
+        )
+        await asyncio.sleep(0.1)
+        late = asyncio.create_task(
+            asgi_request(
+                main.app, "GET", "/modbus/coils", "addr=20&count=1",
+                headers=[("X-Request-Timeout", "0.2")],
+            )
+        )
+        results = await asyncio.gather(busy, late)
+        await asyncio.sleep(0.5)
+        return results
+
+    _, (late_status, _) = asyncio.run(scenario())
+
+    assert late_status == 504
+    assert ("read_coils", 20, 1) not in fake_modbus.calls
+
+
+def test_invalid_request_timeout_header(main, fake_modbus):
+    status_code, _ = asyncio.run(
+        asgi_request(
+            main.app, "GET", "/modbus/coils", "addr=0&count=1",
+            headers=[("X-Request-Timeout", "abc")],
+        )
+    )
+    assert status_code == 422
+
+
+def test_invalid_request_timeout_response_has_cors_headers(main, fake_modbus, monkeypatch):
+    from fastapi.middleware.cors import CORSMiddleware
+
+    cors = next(m for m in main.app.user_middleware if m.cls is CORSMiddleware)
+    monkeypatch.setitem(cors.kwargs, "allow_origins", ["http://hmi.local"])
+    monkeypatch.setattr(main.app, "middleware_stack", None)
+
+    status_code, _, headers = asyncio.run(asgi_request(
+        main.app, "GET", "/modbus/coils", "addr=0&count=1",
+        headers=[("Origin", "http://hmi.local"), ("X-Request-Timeout", "abc")],
+        with_headers=True,
+    ))
+
+    assert status_code == 422
+    assert headers.get("access-control-allow-origin") == "http://hmi.local"
+
+
+def test_close_waits_for_in_flight_transaction(main, fake_modbus):
+    fake_modbus.delays[("read_coils", 0)] = 0.5
+
+    async def scenario():
+        read = asyncio.create_task(
+            asgi_request(main.app, "GET", "/modbus/coils", "addr=0&count=1")
+        )
+        await asyncio.sleep(0.1)
+        close = asyncio.create_task(
+            asgi_request(main.app, "POST", "/modbus/close", headers=[("X-API-Key", API_KEY)])
+        )
+        return await asyncio.gather(read, close)
+
+    (read_status, _), (close_status, _) = asyncio.run(scenario())
+
+    assert read_status == 200
+    assert close_status == 200
+    assert fake_modbus.overlaps == []
+    assert fake_modbus.calls.index(("close", None)) > fake_modbus.calls.index(("read_coils", 0, 1))
@@ -0,0 +1,49 @@
+# tests/test_readiness.py
+import asyncio
+import json
+
+from conftest import asgi_request
+
+
+def ready(main):
+    status_code, body = asyncio.run(asgi_request(main.app, "GET", "/health/ready"))
+    return status_code, json.loads(body)
+
+
+def test_readiness_recovers_after_successful_transaction(main, fake_modbus, monkeypatch):
+    monkeypatch.setattr(main, "READINESS_REQUIRE_MODBUS", True)
+    main.app.state.modbus_connected = False
+
+    assert ready(main)[0] == 503
+
+    status_code, _ = asyncio.run(asgi_request(main.app, "GET", "/modbus/coils", "addr=0&count=1"))
+    assert status_code == 200
+
+    assert ready(main) == (200, {"ready": True, "phase": "serving", "connected": True})
+
+
+def test_supervisor_retries_until_device_is_up(main, fake_modbus, monkeypatch):
+    monkeypatch.setattr(main, "READINESS_REQUIRE_MODBUS", True)
+    monkeypatch.setattr(main, "MODBUS_CONNECT_RETRY_MIN", 0.05)
+    monkeypatch.setattr(main, "MODBUS_CONNECT_RETRY_MAX", 0.1)
+    monkeypatch.setattr(main, "_build_modbus_client", lambda: fake_modbus)
+    fake_modbus.connected = False
+
+    async def scenario():
+        async with main.app.router.lifespan_context(main.app):
+            await asyncio.sleep(0.2)
+            down = await asgi_request(main.app, "GET", "/health/ready")
+            fake_modbus.connected = True
+            await asyncio.sleep(0.3)
+            up = await asgi_request(main.app, "GET", "/health/ready")
+        return down, up
+
+    (down_status, _), (up_status, up_body) = asyncio.run(scenario())
+
+    assert down_status == 503
+    assert up_status == 200
+    assert json.loads(up_body)["connected"] is True
+    assert fake_modbus.calls.count(("is_connected", None)) >= 3
+    # close no shutdown nunca concorre com uma tentativa de conexão
+    assert fake_modbus.calls[-1] == ("close", None)
+    assert fake_modbus.overlaps == []
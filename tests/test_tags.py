@@ -0,0 +1,112 @@
+# tests/test_tags.py
+import asyncio
+import json
+
+import pytest
+
+from conftest import asgi_request
+
+
+@pytest.fixture
+def registry(main, monkeypatch):
+    from tags import compile_tags
+
+    tags = compile_tags([
+        {"name": "a", "table": "holding", "addr": 0, "dtype": "uint16", "endian": "le"},
+        {"name": "b", "table": "holding", "addr": 1, "dtype": "float32", "endian": "be_swap"},
+        {"name": "c", "table": "input", "addr": 1, "dtype": "int32", "endian": "le"},
+    ])
+    monkeypatch.setattr(main.app.state, "tags", tags, raising=False)
+    return tags
+
+
+def get(main, path, query=""):
+    status_code, body = asyncio.run(asgi_request(main.app, "GET", path, query))
+    return status_code, json.loads(body)
+
+
+def test_tag_read_matches_typed_endpoint(main, fake_modbus, registry):
+    fake_modbus.typed[("holding", 1)] = 1.5
+
+    status_code, tag = get(main, "/tags/b")
+    assert status_code == 200
+    status_code, typed = get(main, "/modbus/registers/typed", "table=holding&addr=1&dtype=float32&endian=be_swap")
+    assert status_code == 200
+
+    # Mesma chamada à biblioteca: endian com a mesma semântica
+    assert fake_modbus.calls == [("read_holding_typed", 1, "float32", "be_swap")] * 2
+    assert tag["value"] == typed["value"] == 1.5
+    assert tag["endian"] == typed["endian"] == "be_swap"
+
+
+def test_multiple_tags_keep_request_order(main, fake_modbus, registry):
+    fake_modbus.typed.update({("holding", 0): 7, ("input", 1): -123456})
+
+    status_code, body = get(main, "/tags/values", "names=c&names=a&names=c")
+
+    assert status_code == 200
+    assert [(v["name"], v["value"]) for v in body["values"]] == [("c", -123456), ("a", 7)]
+    # 16 bits: endian do arquivo é ignorado
+    assert fake_modbus.calls == [
+        ("read_input_typed", 1, "int32", "le"),
+        ("read_holding_typed", 0, "uint16", "be"),
+    ]
+
+
+def test_unknown_tag_is_404_without_device_access(main, fake_modbus, registry):
+    status_code, _ = get(main, "/tags/values", "names=a&names=zzz")
+
+    assert status_code == 404
+    assert fake_modbus.calls == []
+
+
+def test_overlapping_tags_are_rejected(main):
+    from tags import compile_tags
+
+    with pytest.raises(ValueError, match="sobrepostas"):
+        compile_tags([
+            {"name": "x", "table": "holding", "addr": 0, "dtype": "float32"},
+            {"name": "y", "table": "holding", "addr": 1, "dtype": "uint16"},
+        ])
+
+
+@pytest.mark.parametrize("name", ["values", "a/b"])
+def test_names_that_cannot_be_routed_are_rejected(main, name):
+    from tags import compile_tags
+
+    with pytest.raises(ValueError, match="nome de tag inválido"):
+        compile_tags([{"name": name, "table": "holding", "addr": 0, "dtype": "uint16"}])
+
+
+def test_overlapping_returns_tags_touched_by_range(main, registry):
+    def names(table, addr, count):
+        return [t.name for t in registry.overlapping(table, addr, count)]
+
+    assert names("holding", 0, 1) == ["a"]
+    assert names("holding", 2, 1) == ["b"]
+    assert names("holding", 0, 4) == ["a", "b"]
+    assert names("holding", 3, 10) == []
+    assert names("input", 0, 1) == []
+    assert names("coil", 0, 1) == []
+
+
+def test_write_log_names_affected_tags(main, registry):
+    assert main.tags_in_range("holding", 1, 4) == "b"
+    assert main.tags_in_range("holding", 10, 1) == "-"
+
+
+def test_yaml_tag_file(main, tmp_path):
+    pytest.importorskip("yaml")
+    from tags import load_tag_registry
+
+    path = tmp_path / "tags.yaml"
+    path.write_text(
+        "tags:\n"
+        "  - {name: temperatura, table: input, addr: 0, dtype: float32, endian: le}\n"
+        "  - {name: setpoint, table: holding, addr: 10, dtype: uint16}\n"
+    )
+
+    tags = load_tag_registry(str(path))
+    assert len(tags) == 2
+    assert tags.get("temperatura").endian_out == "le"
+    assert tags.get("setpoint").read_args[0] == 10
@@ -0,0 +1,122 @@
+# tests/test_tracing.py
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime
+
+import pytest
+
+from conftest import asgi_request
+
+logger = logging.getLogger("test-tracing")
+
+
+@pytest.fixture
+def tracing_file(tmp_path, monkeypatch):
+    """Habilita o tracing com o exportador de arquivo; restaura o estado ao final."""
+    pytest.importorskip("opentelemetry.sdk")
+    import tracing
+
+    for name in ("_tracer", "_propagate", "_SpanKind", "_provider"):
+        monkeypatch.setattr(tracing, name, getattr(tracing, name))
+
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("TRACING_ENABLED", "1")
+    monkeypatch.setenv("TRACING_EXPORTER", "file")
+    monkeypatch.setenv("TRACING_FILE", str(path))
+    monkeypatch.setenv("TRACING_SAMPLE_RATIO", "1")
+
+    def spans():
+        tracing.shutdown_tracing()
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    return tracing, spans
+
+
+def test_queue_wait_is_not_counted_as_pdu_time(main, fake_modbus, tracing_file):
+    tracing, spans = tracing_file
+    assert tracing.setup_tracing(logger)
+
+    main._modbus_lock.acquire()
+    threading.Timer(0.3, main._modbus_lock.release).start()
+    main.modbus_call("read_coils", 0x01, 0, 1, fake_modbus.read_coils_safe, 0, 1)
+
+    by_name = {s["name"]: s for s in spans()}
+
+    assert duration(by_name["modbus.queue_wait"]) >= 0.25
+    assert duration(by_name["modbus.pdu"]) < 0.25
+    assert by_name["modbus.pdu"]["attributes"]["modbus.ok"] is True
+
+
+def test_disabled_by_default(tracing_file, monkeypatch):
+    tracing, _ = tracing_file
+    monkeypatch.delenv("TRACING_ENABLED")
+
+    assert not tracing.setup_tracing(logger)
+    assert not tracing.enabled()
+    with tracing.span("x") as sp:
+        assert sp is None
+
+
+def test_invalid_exporter_disables_tracing(tracing_file, monkeypatch):
+    tracing, _ = tracing_file
+    monkeypatch.setenv("TRACING_EXPORTER", "jaeger")
+
+    assert not tracing.setup_tracing(logger)
+    assert not tracing.enabled()
+
+
+def test_file_exporter_writes_one_span_per_line(tracing_file):
+    tracing, spans = tracing_file
+    assert tracing.setup_tracing(logger)
+
+    with tracing.span("outer", **{"modbus.op": "x"}):
+        with tracing.span("inner"):
+            pass
+
+    inner, outer = spans()
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert inner["parent_id"] == outer["context"]["span_id"]
+    assert outer["attributes"] == {"modbus.op": "x"}
+    assert outer["resource"]["attributes"]["service.name"] == "modbus-api"
+
+
+def test_sampling_follows_incoming_traceparent(tracing_file, monkeypatch):
+    tracing, spans = tracing_file
+    monkeypatch.setenv("TRACING_SAMPLE_RATIO", "0")
+    assert tracing.setup_tracing(logger)
+
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    with tracing.server_span("GET", "/a", {}):
+        pass
+    with tracing.server_span("GET", "/b", {"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}):
+        pass
+
+    exported = spans()
+    assert [s["attributes"]["url.path"] for s in exported] == ["/b"]
+    assert exported[0]["context"]["trace_id"] == f"0x{trace_id}"
+
+
+def test_root_span_is_named_by_route_template(main, fake_modbus, tracing_file, monkeypatch):
+    from tags import TagRegistry
+
+    tracing, spans = tracing_file
+    assert tracing.setup_tracing(logger)
+    monkeypatch.setattr(main.app.state, "tags", TagRegistry([]), raising=False)
+    traced = main.TracingMiddleware(main.app)
+
+    for name in ("pressao", "temperatura"):
+        status_code, _ = asyncio.run(asgi_request(traced, "GET", f"/tags/{name}"))
+        assert status_code == 404
+    asyncio.run(asgi_request(traced, "GET", "/nao-existe"))
+
+    roots = [s for s in spans() if s["kind"] == "SpanKind.SERVER"]
+    assert [s["name"] for s in roots] == ["GET /tags/{name}", "GET /tags/{name}", "GET"]
+    assert roots[0]["attributes"]["http.route"] == "/tags/{name}"
+    assert roots[0]["attributes"]["url.path"] == "/tags/pressao"
+
+
+def duration(s):
+    start, end = (datetime.fromisoformat(s[k]) for k in ("start_time", "end_time"))
+    return (end - start).total_seconds()
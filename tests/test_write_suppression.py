@@ -0,0 +1,147 @@
+# tests/test_write_suppression.py
+import asyncio
+import json
+
+import pytest
+
+from conftest import API_KEY, asgi_request
+
+
+@pytest.fixture
+def suppression(main, fake_modbus, monkeypatch):
+    monkeypatch.setattr(main.write_suppressor, "enabled", True)
+    yield main.write_suppressor
+    main.write_suppressor.clear()
+
+
+def put(main, path, query, body):
+    return asgi_request(
+        main.app, "PUT", path, query,
+        headers=[("X-API-Key", API_KEY), ("Content-Type", "application/json")],
+        body=json.dumps(body).encode(),
+    )
+
+
+def test_repeated_coil_write_is_elided(main, fake_modbus, suppression):
+    async def scenario():
+        first = await put(main, "/modbus/coil", "addr=3", {"value": True})
+        second = await put(main, "/modbus/coil", "addr=3", {"value": True})
+        return first, second
+
+    (s1, b1), (s2, b2) = asyncio.run(scenario())
+
+    assert (s1, json.loads(b1)["elided"]) == (200, False)
+    assert (s2, json.loads(b2)["elided_reason"]) == (200, "unchanged")
+    assert fake_modbus.calls.count(("write_single_coil", 3, True)) == 1
+
+
+def test_multi_coil_write_racing_single_coil_write_invalidates_cache(main, fake_modbus, suppression):
+    # Escrita simples lenta em andamento; a escrita múltipla sobreposta fica na fila
+    fake_modbus.delays[("write_single_coil", 0)] = 0.4
+
+    async def scenario():
+        single = asyncio.create_task(put(main, "/modbus/coil", "addr=0", {"value": True}))
+        await asyncio.sleep(0.1)
+        multi = asyncio.create_task(
+            put(main, "/modbus/coils", "addr=0&count=2", {"values": [False, False]})
+        )
+        await asyncio.gather(single, multi)
+        fake_modbus.delays.clear()
+        return await put(main, "/modbus/coil", "addr=0", {"value": True})
+
+    status_code, body = asyncio.run(scenario())
+
+    assert status_code == 200
+    assert json.loads(body)["elided"] is False
+    assert fake_modbus.coils[0] is True
+    assert fake_modbus.calls.count(("write_single_coil", 0, True)) == 2
+
+
+def burst(main, addr, values):
+    """Primeira escrita lenta no dispositivo; as seguintes chegam enquanto ela está em andamento."""
+    async def scenario():
+        tasks = []
+        for value in values:
+            tasks.append(asyncio.create_task(put(main, "/modbus/coil", f"addr={addr}", {"value": value})))
+            await asyncio.sleep(0.1)
+        return [(status_code, json.loads(body)) for status_code, body in await asyncio.gather(*tasks)]
+
+    return asyncio.run(scenario())
+
+
+def test_superseded_write_reports_newer_write_result(main, fake_modbus, suppression):
+    fake_modbus.delays[("write_single_coil", 2)] = 0.4
+
+    first, middle, last = burst(main, 2, [True, False, False])
+
+    assert first == (200, {"ok": True, "elided": False, "elided_reason": None})
+    assert middle == (200, {"ok": True, "elided": True, "elided_reason": "superseded"})
+    assert last == (200, {"ok": True, "elided": False, "elided_reason": None})
+    assert [c for c in fake_modbus.calls if c[:2] == ("write_single_coil", 2)] == [
+        ("write_single_coil", 2, True),
+        ("write_single_coil", 2, False),
+    ]
+    assert fake_modbus.coils[2] is False
+
+
+def test_superseded_write_fails_when_newer_write_is_rate_limited(main, fake_modbus, suppression):
+    async def consume(n):
+        for i in range(n):
+            await put(main, "/modbus/coil", f"addr={10 + i}", {"value": True})
+
+    # 4 das 5 escritas/s já consumidas: só a primeira da rajada é enviada
+    asyncio.run(consume(4))
+    fake_modbus.delays[("write_single_coil", 2)] = 0.4
+
+    first, middle, last = burst(main, 2, [True, False, False])
+
+    assert first[0] == 200
+    assert last[0] == 429
+    # A escrita intermediária não foi aplicada: não pode reportar sucesso
+    assert middle[0] == 503
+    assert fake_modbus.coils[2] is True
+    assert [c for c in fake_modbus.calls if c[:2] == ("write_single_coil", 2)] == [
+        ("write_single_coil", 2, True),
+    ]
+
+
+@pytest.mark.parametrize("path", ["/modbus/close", "/modbus/reconnect"])
+def test_close_forgets_write_in_flight(main, fake_modbus, suppression, path):
+    fake_modbus.delays[("write_single_coil", 1)] = 0.3
+
+    async def scenario():
+        write = asyncio.create_task(put(main, "/modbus/coil", "addr=1", {"value": True}))
+        await asyncio.sleep(0.1)
+        status_code, _ = await asgi_request(main.app, "POST", path, headers=[("X-API-Key", API_KEY)])
+        assert status_code == 200
+        await write
+        fake_modbus.delays.clear()
+        return await put(main, "/modbus/coil", "addr=1", {"value": True})
+
+    status_code, body = asyncio.run(scenario())
+
+    # O dispositivo pode ter reiniciado: a mesma escrita é enviada novamente
+    assert (status_code, json.loads(body)["elided"]) == (200, False)
+    assert fake_modbus.calls.count(("write_single_coil", 1, True)) == 2
+
+
+def test_elided_writes_do_not_consume_rate_limit(main, fake_modbus, suppression):
+    async def scenario():
+        return [
+            (await put(main, "/modbus/coil", "addr=5", {"value": True}))[0]
+            for _ in range(8)
+        ]
+
+    assert asyncio.run(scenario()) == [200] * 8
+    assert fake_modbus.calls.count(("write_single_coil", 5, True)) == 1
+
+
+def test_effective_writes_are_rate_limited(main, fake_modbus, suppression):
+    async def scenario():
+        return [
+            (await put(main, "/modbus/coil", "addr=6", {"value": i % 2 == 0}))[0]
+            for i in range(6)
+        ]
+
+    assert asyncio.run(scenario()) == [200] * 5 + [429]
+    assert len([c for c in fake_modbus.calls if c[:2] == ("write_single_coil", 6)]) == 5
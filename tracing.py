@@ -0,0 +1,136 @@
+# tracing.py
+"""
+Tracing opcional compatível com OpenTelemetry.
+
+Quando TRACING_ENABLED=1 e o SDK do OpenTelemetry está instalado, os spans são
+exportados para um coletor OTLP, para um arquivo JSONL ou para o console.
+Caso contrário, todas as funções deste módulo são no-op de custo desprezível.
+"""
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Optional
+
+_NOOP = nullcontext()
+
+_tracer = None
+_propagate = None
+_SpanKind = None
+_provider = None
+
+
+def setup_tracing(logger) -> bool:
+    """Inicializa o tracer global a partir das variáveis de ambiente.
+
+    Deve ser chamado após load_dotenv(). Retorna True se o tracing foi ativado.
+    """
+    global _tracer, _propagate, _SpanKind, _provider
+
+    if os.getenv("TRACING_ENABLED", "0") != "1":
+        return False
+
+    exporter_name = os.getenv("TRACING_EXPORTER", "otlp").lower()
+    sample_ratio = float(os.getenv("TRACING_SAMPLE_RATIO", 0.1))
+    service_name = os.getenv("TRACING_SERVICE_NAME", "modbus-api")
+
+    try:
+        from opentelemetry import trace, propagate
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        if exporter_name == "otlp":
+            # Endpoint via OTEL_EXPORTER_OTLP_ENDPOINT (default http://localhost:4318)
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter()
+        elif exporter_name == "file":
+            out = open(os.getenv("TRACING_FILE", "traces.jsonl"), "a", encoding="utf-8")
+            exporter = ConsoleSpanExporter(
+                out=out,
+                formatter=lambda s: s.to_json(indent=None) + "\n",
+            )
+        elif exporter_name == "console":
+            exporter = ConsoleSpanExporter()
+        else:
+            logger.error(f"TRACING exporter inválido exporter={exporter_name}")
+            return False
+
+    except ImportError as e:
+        logger.warning(f"TRACING desabilitado: OpenTelemetry não instalado err={e}")
+        return False
+
+    # ParentBased: respeita a decisão de amostragem de um traceparent recebido
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+
+    _tracer = _provider.get_tracer("modbus-api")
+    _propagate = propagate
+    _SpanKind = trace.SpanKind
+
+    logger.info(
+        f"TRACING habilitado exporter={exporter_name} sample_ratio={sample_ratio}"
+    )
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Descarrega spans pendentes no exportador."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **attributes: Any):
+    """Context manager de span filho do span corrente (no-op se desabilitado)."""
+    if _tracer is None:
+        return _NOOP
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+@contextmanager
+def server_span(method: str, path: str, headers):
+    """Span raiz de uma requisição HTTP, continuando um traceparent W3C recebido.
+
+    O nome inicial é apenas o método; `set_route` o completa com o template
+    da rota, mantendo a cardinalidade baixa (ex.: `GET /tags/{name}`).
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    ctx = _propagate.extract(dict(headers))
+    with _tracer.start_as_current_span(
+        method,
+        context=ctx,
+        kind=_SpanKind.SERVER,
+        attributes={"http.request.method": method, "url.path": path},
+    ) as s:
+        yield s
+
+
+def set_route(s, method: str, route: str) -> None:
+    """Nomeia o span raiz pelo template da rota resolvida."""
+    if s is not None and s.is_recording():
+        s.update_name(f"{method} {route}")
+        s.set_attribute("http.route", route)
+
+
+def record_span(name: str, start_ns: int, end_ns: Optional[int] = None, **attributes: Any) -> None:
+    """Registra um span já concluído (ex.: tempo de espera em fila)."""
+    if _tracer is None:
+        return
+    s = _tracer.start_span(name, start_time=start_ns, attributes=attributes)
+    s.end(end_time=end_ns if end_ns is not None else time.time_ns())
+
+
+def set_attribute(s, key: str, value: Any) -> None:
+    if s is not None and s.is_recording():
+        s.set_attribute(key, value)
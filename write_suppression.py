@@ -0,0 +1,178 @@
+# write_suppression.py
+"""
+Supressão de escritas redundantes (coils e holding registers).
+
+Mantém o último valor confirmado por endereço. Uma escrita idêntica ao
+estado conhecido do dispositivo, dentro da janela de validade, é omitida.
+Escritas concorrentes no mesmo endereço são colapsadas: apenas a mais
+recente é enviada; as anteriores aguardam o resultado dela e são reportadas
+como substituídas.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+Key = Tuple[str, int]
+
+ELIDED_UNCHANGED = "unchanged"
+ELIDED_SUPERSEDED = "superseded"
+
+
+class _Slot:
+    __slots__ = ("lock", "generation", "users", "settled_generation", "settled_ok")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.users = 0
+        # Geração mais recente com resultado conhecido, e esse resultado
+        self.settled_generation = 0
+        self.settled_ok = False
+
+
+class WriteGuard:
+    """Resultado da admissão de uma escrita: `elided` indica se ela foi omitida.
+
+    Para escritas substituídas, `ok` é o resultado da escrita mais recente
+    que as substituiu.
+    """
+
+    __slots__ = ("_owner", "_key", "_count", "_value", "_slot", "_generation", "elided", "ok")
+
+    def __init__(self, owner, key: Key, count: int, value: Any, elided: Optional[str],
+                 slot: Optional[_Slot] = None, generation: int = 0, ok: Optional[bool] = None):
+        self._owner = owner
+        self._key = key
+        self._count = count
+        self._value = value
+        self._slot = slot
+        self._generation = generation
+        self.elided = elided
+        self.ok = ok
+
+    def done(self, ok: bool) -> None:
+        """Registra o resultado da escrita enviada ao dispositivo."""
+        self.ok = ok
+        if self._owner is None:
+            return
+        if ok:
+            self._owner.confirm(self._key[0], self._key[1], self._count, self._value)
+        else:
+            # Estado do dispositivo desconhecido após falha
+            self._owner.invalidate(self._key[0], self._key[1], self._count)
+        self._owner._settle(self._slot, self._generation, ok)
+
+
+class WriteSuppressor:
+    def __init__(self, ttl: float, enabled: bool = True):
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._settled = threading.Condition(self._lock)
+        # (table, addr) -> (count, value, confirmed_at)
+        self._state: Dict[Key, Tuple[int, Any, float]] = {}
+        self._slots: Dict[Key, _Slot] = {}
+
+    def _is_current(self, key: Key, count: int, value: Any) -> bool:
+        entry = self._state.get(key)
+        if entry is None:
+            return False
+        known_count, known_value, confirmed_at = entry
+        return (
+            known_count == count
+            and known_value == value
+            and time.monotonic() - confirmed_at <= self.ttl
+        )
+
+    def _invalidate_locked(self, table: str, addr: int, count: int) -> None:
+        end = addr + count
+        for key in [
+            k for k, (n, _, _) in self._state.items()
+            if k[0] == table and k[1] < end and addr < k[1] + n
+        ]:
+            del self._state[key]
+
+    def confirm(self, table: str, addr: int, count: int, value: Any) -> None:
+        with self._lock:
+            self._invalidate_locked(table, addr, count)
+            self._state[(table, addr)] = (count, value, time.monotonic())
+
+    def invalidate(self, table: str, addr: int, count: int = 1) -> None:
+        """Descarta o estado conhecido de qualquer entrada que sobreponha o intervalo."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._invalidate_locked(table, addr, count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._state.clear()
+
+    def _settle(self, slot: _Slot, generation: int, ok: bool) -> None:
+        """Publica o resultado de uma geração para as escritas que ela substituiu."""
+        with self._lock:
+            if generation > slot.settled_generation:
+                slot.settled_generation = generation
+                slot.settled_ok = ok
+                self._settled.notify_all()
+
+    @contextmanager
+    def guard(self, table: str, addr: int, count: int, value: Any):
+        """Admite uma escrita no endereço, serializando escritas concorrentes nele.
+
+        O guard produzido tem `elided` = None quando a escrita deve ser enviada;
+        nesse caso o chamador informa o resultado via `guard.done(ok)`. Se o
+        bloco terminar sem `done` (rate limit, deadline, exceção), a escrita
+        conta como falha. Uma escrita substituída só é liberada quando a mais
+        recente tem resultado, disponível em `guard.ok`.
+        """
+        key = (table, addr)
+
+        if not self.enabled:
+            yield WriteGuard(None, key, count, value, None)
+            return
+
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _Slot()
+            slot.generation += 1
+            slot.users += 1
+            generation = slot.generation
+
+        try:
+            with slot.lock:
+                with self._lock:
+                    if slot.generation != generation:
+                        elided = ELIDED_SUPERSEDED
+                    elif self._is_current(key, count, value):
+                        elided = ELIDED_UNCHANGED
+                    else:
+                        elided = None
+
+                if elided is None:
+                    guard = WriteGuard(self, key, count, value, None, slot, generation)
+                    try:
+                        yield guard
+                    finally:
+                        if guard.ok is None:
+                            self._settle(slot, generation, False)
+                    return
+
+                if elided == ELIDED_UNCHANGED:
+                    self._settle(slot, generation, True)
+                    yield WriteGuard(self, key, count, value, elided, ok=True)
+                    return
+
+            # Substituída: aguarda (fora do slot.lock) o resultado da mais recente
+            with self._lock:
+                while slot.settled_generation <= generation:
+                    self._settled.wait()
+                ok = slot.settled_ok
+            yield WriteGuard(self, key, count, value, elided, ok=ok)
+        finally:
+            with self._lock:
+                slot.users -= 1
+                if slot.users == 0:
+                    del self._slots[key]